@@ -3,22 +3,45 @@
 # Modified to use external audio file as alarm
 
 import os
+import sys
+import math
+import shutil
+import platform
+import subprocess
 
 # import necessary packages
-from scipy.spatial import distance as dist
-from imutils.video import VideoStream
-from threading import Thread
+from threading import Thread, Condition
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
+import argparse
 import numpy as np
-import imutils
 import time
 import mediapipe as mp
 import cv2
 
+# Numba is optional: when available the EAR kernel is JIT-compiled
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # define constants
 WEBCAM = 0 # webcam index (0 for default webcam)
+SOURCES = [WEBCAM] # Webcam indices to monitor (e.g. [0, 1]), one Face Mesh graph each
 EYE_THRESHOLD = 0.68 # Eye aspect ratio (EAR) threshold
-NUM_CONSECUTIVE_FRAMES = 100 # Number of consecutive frames to trigger alarm
-COUNTER = 0 # Consecutive frames counter
+TARGET_FPS = 15 # Frames per second actually decoded and processed
+SOURCE_TIMEOUT = 1.0 # Seconds without frames after which a source's last EAR is ignored
+DISPLAY_WIDTH = 800 # Width of the frame shown on screen
+DISPLAY_FPS = 20 # Maximum frames per second rendered on screen
+INFERENCE_WIDTH = 320 # Width of the frame sent to MediaPipe
+MESH_EVERY_N_FRAMES = 2 # Run Face Mesh every Nth frame, reuse landmarks in between
+FACE_LANDMARKER_MODEL = "face_landmarker.task" # Tasks API model; legacy Face Mesh is used if missing
+USE_GPU = True # Run the Tasks API model on the GPU delegate when supported
+USE_PROCESS_POOL = False # Run landmark detection in worker processes instead of threads
+USE_OPENCL = False # Resize/convert frames through OpenCV's T-API (OpenCL); enable only if measured faster
+CLOSED_EYES_SECONDS = 3.0 # Seconds with eyes closed to trigger alarm
+EYES_CLOSED_SINCE = None # time.monotonic() when the eyes closed, None while open
 ALARM_ON = False # Alarm state
 ALARM_THREAD = None # Alarm thread
 
@@ -30,6 +53,16 @@ ALARM_FILE = ".../alarm.wav"  # Example: "C:/Users/your_user/Desktop/alarm.wav"
 # Variable to control which audio library to use
 AUDIO_LIBRARY = None
 
+# Callable that plays the alarm file once, bound by check_audio_library so the
+# alarm thread never re-imports libraries or re-reads the file
+AUDIO_PLAYER = None
+
+# System alarm used when no audio file can be played, bound once by
+# check_system_alarm: either a command run as one long-lived process for the
+# whole alarm, or a callable producing one beep cycle
+SYSTEM_ALARM_COMMAND = None
+SYSTEM_BEEP = None
+
 # Eye landmark indices in MediaPipe Face Mesh
 # Left eye (from person's perspective)
 LEFT_EYE_LANDMARKS = [33, 7, 163, 144, 145, 153, 154, 155, 133, 173, 157, 158, 159, 160, 161, 246]
@@ -41,14 +74,25 @@ RIGHT_EYE_LANDMARKS = [362, 382, 381, 380, 374, 373, 390, 249, 263, 466, 388, 38
 LEFT_EYE_EAR_POINTS = [33, 159, 133, 145, 158, 153]  # left
 RIGHT_EYE_EAR_POINTS = [362, 385, 263, 374, 386, 380]  # right
 
+# Eye contour indices as arrays, used to index the landmark buffer
+LEFT_EYE_IDX = np.array(LEFT_EYE_LANDMARKS, dtype=np.int32)
+RIGHT_EYE_IDX = np.array(RIGHT_EYE_LANDMARKS, dtype=np.int32)
+
+# EAR indices for both eyes, used to gather all 12 points in one indexing op
+EAR_IDX = np.array(LEFT_EYE_EAR_POINTS + RIGHT_EYE_EAR_POINTS, dtype=np.int32)
+
+# Number of landmarks returned by Face Mesh with refine_landmarks=True and by
+# the Tasks API FaceLandmarker
+NUM_LANDMARKS = 478
+
 
 def check_audio_library():
     """
-    Check which audio library is available and test the file
+    Check which audio library is available, test the file and bind AUDIO_PLAYER
     
     :return: string indicating available library or None
     """
-    global AUDIO_LIBRARY
+    global AUDIO_LIBRARY, AUDIO_PLAYER
     
     # Check if file exists
     if not os.path.exists(ALARM_FILE):
@@ -60,9 +104,17 @@ def check_audio_library():
     try:
         import pygame
         pygame.mixer.init()
-        # Test if it can load the file
-        pygame.mixer.Sound(ALARM_FILE)
+        # Load the file once; the same Sound is replayed on every alarm
+        sound = pygame.mixer.Sound(ALARM_FILE)
+        
+        def play_pygame():
+            sound.play()
+            # Wait for sound to finish or until interrupted
+            while pygame.mixer.get_busy() and ALARM_ON:
+                time.sleep(0.1)
+        
         AUDIO_LIBRARY = "pygame"
+        AUDIO_PLAYER = play_pygame
         print(f"[INFO] Using pygame to play: {ALARM_FILE}")
         return "pygame"
     except ImportError:
@@ -72,9 +124,14 @@ def check_audio_library():
     
     # Try playsound (simple but effective)
     try:
-        import playsound
-        # Test playback (silent, just to check if it works)
+        from playsound import playsound
+        
+        def play_playsound():
+            playsound(ALARM_FILE, block=False)
+            time.sleep(1)  # Small pause between reproductions
+        
         AUDIO_LIBRARY = "playsound"
+        AUDIO_PLAYER = play_playsound
         print(f"[INFO] Using playsound to play: {ALARM_FILE}")
         return "playsound"
     except ImportError:
@@ -86,9 +143,14 @@ def check_audio_library():
     try:
         from pydub import AudioSegment
         from pydub.playback import play
-        # Test if it can load the file
-        AudioSegment.from_file(ALARM_FILE)
+        # Load the file once; the same segment is replayed on every alarm
+        audio = AudioSegment.from_file(ALARM_FILE)
+        
+        def play_pydub():
+            play(audio)
+        
         AUDIO_LIBRARY = "pydub"
+        AUDIO_PLAYER = play_pydub
         print(f"[INFO] Using pydub to play: {ALARM_FILE}")
         return "pydub"
     except ImportError:
@@ -99,9 +161,14 @@ def check_audio_library():
     # Try winsound (Windows only, for .wav files)
     try:
         import winsound
-        import platform
         if platform.system() == "Windows" and ALARM_FILE.lower().endswith('.wav'):
+            
+            def play_winsound():
+                winsound.PlaySound(ALARM_FILE, winsound.SND_FILENAME | winsound.SND_ASYNC)
+                time.sleep(1)
+            
             AUDIO_LIBRARY = "winsound"
+            AUDIO_PLAYER = play_winsound
             print(f"[INFO] Using winsound to play: {ALARM_FILE}")
             return "winsound"
     except ImportError:
@@ -116,39 +183,13 @@ def check_audio_library():
 
 def play_audio_file():
     """
-    Play audio file using available library
+    Play audio file using the player bound by check_audio_library
     
     :return: True if successful, False otherwise
     """
     try:
-        if AUDIO_LIBRARY == "pygame":
-            import pygame
-            if not pygame.mixer.get_init():
-                pygame.mixer.init()
-            sound = pygame.mixer.Sound(ALARM_FILE)
-            sound.play()
-            # Wait for sound to finish or until interrupted
-            while pygame.mixer.get_busy() and ALARM_ON:
-                time.sleep(0.1)
-            return True
-            
-        elif AUDIO_LIBRARY == "playsound":
-            import playsound
-            playsound.playsound(ALARM_FILE, block=False)
-            time.sleep(1)  # Small pause between reproductions
-            return True
-            
-        elif AUDIO_LIBRARY == "pydub":
-            from pydub import AudioSegment
-            from pydub.playback import play
-            audio = AudioSegment.from_file(ALARM_FILE)
-            play(audio)
-            return True
-            
-        elif AUDIO_LIBRARY == "winsound":
-            import winsound
-            winsound.PlaySound(ALARM_FILE, winsound.SND_FILENAME | winsound.SND_ASYNC)
-            time.sleep(1)
+        if AUDIO_PLAYER:
+            AUDIO_PLAYER()
             return True
             
     except Exception as e:
@@ -157,13 +198,74 @@ def play_audio_file():
     return False
 
 
+def beep_terminal():
+    """
+    Basic terminal beep (multiplatform), the last-resort system alarm
+    
+    :return: None
+    """
+    sys.stdout.write('\a')
+    sys.stdout.flush()
+    time.sleep(1)
+
+
+def check_system_alarm():
+    """
+    Resolve once which system alarm to use when no audio file can be played
+    
+    :return: string indicating the system alarm
+    """
+    global SYSTEM_ALARM_COMMAND, SYSTEM_BEEP
+    
+    # Method 1: Windows - winsound (more reliable)
+    try:
+        import winsound
+        
+        def beep_winsound():
+            winsound.Beep(1000, 200)
+            time.sleep(0.3)
+        
+        SYSTEM_BEEP = beep_winsound
+        return "winsound"
+    except ImportError:
+        pass
+    
+    # Terminal beep stays bound as fallback if a system command fails at runtime
+    SYSTEM_BEEP = beep_terminal
+    
+    # Method 2: Linux/Mac - system command
+    system = platform.system().lower()
+    if 'linux' in system:
+        # A single repeating process instead of one process per beep
+        if shutil.which('beep'):
+            SYSTEM_ALARM_COMMAND = ['beep', '-f', '1000', '-l', '200', '-d', '300', '-r', '1000000']
+            return "beep"
+        if shutil.which('speaker-test'):
+            SYSTEM_ALARM_COMMAND = ['speaker-test', '-t', 'sine', '-f', '1000']
+            return "speaker-test"
+    elif 'darwin' in system and shutil.which('say'):  # Mac
+        
+        def beep_say():
+            subprocess.run(['say', 'Drowsiness alert'], check=False)
+            time.sleep(1)
+        
+        SYSTEM_BEEP = beep_say
+        return "say"
+    
+    # Method 3: Basic terminal beep (multiplatform)
+    return "terminal"
+
+
 def trigger_continuous_alarm():
     """
     Trigger continuous sound alarm using external file or system alarm
     
     :return: None
     """
-    global ALARM_ON
+    global ALARM_ON, SYSTEM_ALARM_COMMAND
+    
+    # Long-lived system alarm process, started on first use
+    process = None
     
     while ALARM_ON:
         # Try to play audio file first
@@ -174,253 +276,826 @@ def trigger_continuous_alarm():
         
         # Fallback to system alarm if file doesn't work
         try:
-            # Method 1: Windows - winsound (more reliable)
-            import winsound
-            if ALARM_ON:
-                winsound.Beep(1000, 200)
-                time.sleep(0.3)
-            continue
-        except ImportError:
-            pass
+            if SYSTEM_ALARM_COMMAND:
+                try:
+                    if process is None:
+                        process = subprocess.Popen(SYSTEM_ALARM_COMMAND, stdout=subprocess.DEVNULL,
+                                                   stderr=subprocess.DEVNULL)
+                    # Keep sounding while the process is alive
+                    if process.poll() is None:
+                        time.sleep(0.1)
+                        continue
+                    error = f"exited with code {process.returncode}"
+                except OSError as e:
+                    error = str(e)
+                # The command does not work here (e.g. no access to the PC
+                # speaker): switch to the terminal beep for the rest of the session
+                print(f"[WARNING] System alarm '{SYSTEM_ALARM_COMMAND[0]}' failed ({error}), "
+                      "using terminal beep")
+                SYSTEM_ALARM_COMMAND = None
+                process = None
+            if SYSTEM_BEEP:
+                SYSTEM_BEEP()
+                continue
         except Exception as e:
-            print(f"Error with winsound: {e}")
-        
-        try:
-            # Method 2: Basic terminal beep (multiplatform)
-            import sys
-            if ALARM_ON:
-                for i in range(3):
-                    if not ALARM_ON:
-                        break
-                    sys.stdout.write('\a')
-                    sys.stdout.flush()
-                    time.sleep(0.1)
-                time.sleep(0.5)
-            continue
-        except Exception as e:
-            print(f"Error with basic beep: {e}")
-        
-        try:
-            # Method 3: Linux/Mac - system command
-            import subprocess
-            import platform
-            
-            system = platform.system().lower()
-            if ALARM_ON:
-                if 'linux' in system:
-                    try:
-                        subprocess.run(['beep', '-f', '1000', '-l', '200'], check=False)
-                    except FileNotFoundError:
-                        subprocess.run(['speaker-test', '-t', 'sine', '-f', '1000', '-l', '1'], 
-                                     timeout=1, check=False, capture_output=True)
-                elif 'darwin' in system:  # Mac
-                    subprocess.run(['say', 'Drowsiness alert'], check=False)
-                
-                time.sleep(1)
-            continue
-        except Exception as e:
-            print(f"Error with system command: {e}")
+            print(f"Error with system alarm: {e}")
         
         # Final method: visual warning only
         if ALARM_ON:
             print("🚨 DROWSINESS ALERT! 🚨")
             time.sleep(1)
+    
+    # Alarm stopped: silence the system alarm process
+    if process is not None and process.poll() is None:
+        process.terminate()
 
 
-def calculate_eye_ratio(landmarks, eye_points):
+def fill_landmark_buffer(landmarks, out):
     """
-    Calculate eye aspect ratio using MediaPipe landmarks
+    Copy the normalized (x, y) of every landmark into a preallocated buffer
     
     :param landmarks: facial landmarks from MediaPipe
-    :param eye_points: eye point indices for calculation
-    :return: eye aspect ratio (EAR)
+    :param out: preallocated (number of landmarks, 2) float32 array to fill
+    :return: out, filled with the landmark coordinates
+    """
+    # One bulk copy: per-element ndarray assignment costs far more than
+    # streaming the protobuf fields through np.fromiter
+    count = len(landmarks)
+    out[:count] = np.fromiter(
+        (c for lm in landmarks for c in (lm.x, lm.y)),
+        dtype=np.float32, count=count * 2
+    ).reshape(count, 2)
+    return out
+
+
+def _ear_kernel(xy, idx):
+    """
+    Average eye aspect ratio of both eyes as a scalar loop (Numba target)
+    
+    :param xy: (N, 2) float32 array with the coordinates of all landmarks
+    :param idx: 12 EAR point indices, left eye followed by right eye
+    :return: average eye aspect ratio (EAR) of both eyes
+    """
+    total = 0.0
+    for eye in range(2):
+        o = eye * 6
+        p0 = idx[o]
+        p1 = idx[o + 1]
+        p2 = idx[o + 2]
+        p3 = idx[o + 3]
+        p4 = idx[o + 4]
+        p5 = idx[o + 5]
+        A = math.hypot(xy[p1, 0] - xy[p5, 0], xy[p1, 1] - xy[p5, 1])  # top-bottom 1
+        B = math.hypot(xy[p2, 0] - xy[p4, 0], xy[p2, 1] - xy[p4, 1])  # top-bottom 2
+        C = math.hypot(xy[p0, 0] - xy[p3, 0], xy[p0, 1] - xy[p3, 1])  # outer - inner corner
+        if C > 0:
+            total += (A + B) / (2.0 * C)
+    return total / 2.0
+
+
+if NUMBA_AVAILABLE:
+    _ear_kernel = njit(cache=True, fastmath=True)(_ear_kernel)
+
+
+def calculate_eye_ratio(landmark_xy):
     """
-    # Extract coordinates of specific eye points
-    eye_coords = []
-    for point in eye_points:
-        x = landmarks[point].x
-        y = landmarks[point].y
-        eye_coords.append([x, y])
+    Calculate eye aspect ratio of both eyes using MediaPipe landmarks
     
-    eye_coords = np.array(eye_coords)
+    :param landmark_xy: (N, 2) array with the coordinates of all landmarks
+    :return: average eye aspect ratio (EAR) of both eyes
+    """
+    # Compiled scalar kernel avoids NumPy dispatch for 12 points
+    if NUMBA_AVAILABLE:
+        return _ear_kernel(landmark_xy, EAR_IDX)
+    
+    # Gather the 6 EAR points of each eye: shape (eye, point, xy)
+    pts = landmark_xy[EAR_IDX].reshape(2, 6, 2)
     
     # Calculate euclidean distances
     # Vertical distances
-    A = dist.euclidean(eye_coords[1], eye_coords[5])  # top-bottom 1
-    B = dist.euclidean(eye_coords[2], eye_coords[4])  # top-bottom 2
+    A = np.linalg.norm(pts[:, 1] - pts[:, 5], axis=1)  # top-bottom 1
+    B = np.linalg.norm(pts[:, 2] - pts[:, 4], axis=1)  # top-bottom 2
     
     # Horizontal distance
-    C = dist.euclidean(eye_coords[0], eye_coords[3])  # outer corner - inner corner
+    C = np.linalg.norm(pts[:, 0] - pts[:, 3], axis=1)  # outer corner - inner corner
     
-    # Calculate EAR
-    if C > 0:
-        ear = (A + B) / (2.0 * C)
-    else:
-        ear = 0
+    # Calculate EAR (0 for an eye with degenerate width)
+    ear = np.divide(A + B, 2.0 * C, out=np.zeros_like(C), where=C > 0)
         
-    return ear
+    return float(ear.mean())
 
 
-def extract_eye_coordinates(landmarks, eye_landmarks):
+def extract_eye_coordinates(landmark_xy, eye_idx, width, height, out):
     """
     Extract eye landmark coordinates for visualization
     
-    :param landmarks: facial landmarks
-    :param eye_landmarks: eye landmark indices
-    :return: array with eye point coordinates
-    """
-    coords = []
-    for point in eye_landmarks:
-        x = int(landmarks[point].x * frame.shape[1])
-        y = int(landmarks[point].y * frame.shape[0])
-        coords.append([x, y])
-    return np.array(coords)
-
-
-# Check available audio library
-print("[INFO] Checking audio libraries...")
-check_audio_library()
-
-# Initialize MediaPipe
-mp_face_mesh = mp.solutions.face_mesh
-mp_drawing = mp.solutions.drawing_utils
-mp_drawing_styles = mp.solutions.drawing_styles
-
-# Configure Face Mesh
-face_mesh = mp_face_mesh.FaceMesh(
-    max_num_faces=1,
-    refine_landmarks=True,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
-
-# initialize video stream
-print("[INFO] Starting video stream...")
-vs = VideoStream(src=WEBCAM).start()
-time.sleep(2.0)
-
-print("[INFO] Drowsiness detector started. Press 'q' to quit.")
-print(f"[INFO] Eye threshold: {EYE_THRESHOLD}")
-print(f"[INFO] Required consecutive frames: {NUM_CONSECUTIVE_FRAMES}")
-if AUDIO_LIBRARY:
-    print(f"[INFO] Alarm file: {ALARM_FILE}")
-else:
-    print("[INFO] Using system alarm")
-
-# loop over video frames
-while True:
-    frame = vs.read()
-    if frame is None:
-        continue
+    :param landmark_xy: (N, 2) array with the normalized coordinates of all landmarks
+    :param eye_idx: eye landmark indices
+    :param width: width of the frame the coordinates are drawn on
+    :param height: height of the frame the coordinates are drawn on
+    :param out: preallocated (len(eye_idx), 1, 2) int32 array to fill
+    :return: out, filled with the eye point pixel coordinates
+    """
+    # Scale and truncate straight into the int32 layout OpenCV draws from
+    np.multiply(landmark_xy[eye_idx], (width, height), out=out[:, 0], casting='unsafe')
+    return out
+
+
+class FrameGrabber:
+    """
+    Capture webcam frames on a background thread, keeping only the latest one
+    so capture and decoding never serialize with MediaPipe inference
+    """
+    
+    def __init__(self, src, target_fps, condition=None):
+        """
+        :param src: webcam index
+        :param target_fps: frames per second actually decoded
+        :param condition: Condition notified on every new frame; share one
+            between grabbers to wait for a frame from any of them
+        """
+        self.cap = cv2.VideoCapture(src)
+        # MJPG keeps USB bandwidth low; a 1-frame buffer avoids stale frames
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.target_fps = target_fps
+        self.frame = None
+        self.frame_id = 0
+        self.stopped = False
+        self.condition = condition if condition is not None else Condition()
+        self.thread = Thread(target=self.update)
+        self.thread.daemon = True
+    
+    def start(self):
+        """
+        Start the capture thread
         
-    frame = imutils.resize(frame, width=800)
-    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        :return: self
+        """
+        self.thread.start()
+        return self
     
-    # Process frame with MediaPipe
-    results = face_mesh.process(rgb_frame)
+    def update(self):
+        """
+        Capture loop run by the background thread
+        
+        :return: None
+        """
+        last_retrieve_time = 0.0
+        while not self.stopped:
+            # Always grab to keep the driver buffer drained, but only decode
+            # (retrieve) the frames that will actually be processed
+            if not self.cap.grab():
+                time.sleep(0.01)
+                continue
+            now = time.monotonic()
+            if now - last_retrieve_time < 1.0 / self.target_fps:
+                continue
+            ret, frame = self.cap.retrieve()
+            if not ret:
+                continue
+            last_retrieve_time = now
+            
+            # Latest frame wins: an unread previous frame is simply replaced
+            with self.condition:
+                self.frame = frame
+                self.frame_id += 1
+                self.condition.notify_all()
     
-    if results.multi_face_landmarks:
-        for face_landmarks in results.multi_face_landmarks:
-            # Calculate EAR for both eyes
-            left_ear = calculate_eye_ratio(face_landmarks.landmark, LEFT_EYE_EAR_POINTS)
-            right_ear = calculate_eye_ratio(face_landmarks.landmark, RIGHT_EYE_EAR_POINTS)
+    def read(self, last_id=0, timeout=1.0):
+        """
+        Wait for a frame newer than the last one read
+        
+        :param last_id: id of the last frame read by the caller
+        :param timeout: maximum time to wait, in seconds
+        :return: tuple (frame id, frame); the id equals last_id on timeout
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.frame_id != last_id or self.stopped, timeout)
+            return self.frame_id, self.frame
+    
+    def stop(self):
+        """
+        Stop the capture thread and release the webcam
+        
+        :return: None
+        """
+        self.stopped = True
+        self.thread.join(timeout=1.0)
+        self.cap.release()
+
+
+def create_face_landmarker():
+    """
+    Create a Tasks API FaceLandmarker, on the GPU delegate when possible
+    
+    :return: FaceLandmarker, or None if the model file is not available
+    """
+    if not os.path.exists(FACE_LANDMARKER_MODEL):
+        return None
+    
+    vision = mp.tasks.vision
+    delegates = [mp.tasks.BaseOptions.Delegate.GPU] if USE_GPU else []
+    delegates.append(mp.tasks.BaseOptions.Delegate.CPU)
+    
+    for delegate in delegates:
+        options = vision.FaceLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=FACE_LANDMARKER_MODEL,
+                                              delegate=delegate),
+            running_mode=vision.RunningMode.VIDEO,
+            num_faces=1,
+            min_face_detection_confidence=0.5,
+            min_face_presence_confidence=0.5,
+            min_tracking_confidence=0.5,
+            output_face_blendshapes=False,
+            output_facial_transformation_matrixes=False
+        )
+        try:
+            landmarker = vision.FaceLandmarker.create_from_options(options)
+            print(f"[INFO] Using FaceLandmarker ({delegate.name}) with: {FACE_LANDMARKER_MODEL}")
+            return landmarker
+        except Exception as e:
+            print(f"[WARNING] Error creating FaceLandmarker ({delegate.name}): {e}")
+    
+    return None
+
+
+def configure_opencv():
+    """
+    Enable OpenCV's optimized code paths, internal threading and, if
+    requested and available, the T-API (OpenCL)
+    
+    :return: True if OpenCL is used, False otherwise
+    """
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(max(1, (os.cpu_count() or 1) // 2))
+    cv2.ocl.setUseOpenCL(USE_OPENCL and cv2.ocl.haveOpenCL())
+    return cv2.ocl.useOpenCL()
+
+
+def resize_to_width(frame, width, shape=None):
+    """
+    Resize a BGR frame to a given width, keeping its aspect ratio
+    
+    :param frame: BGR frame, as an array or a cv2.UMat on the OpenCL device
+    :param width: target width
+    :param shape: shape of frame, required when frame is a cv2.UMat
+    :return: resized frame, of the same type as frame
+    """
+    (frame_h, frame_w) = (shape if shape is not None else frame.shape)[:2]
+    return cv2.resize(frame, (width, int(width * frame_h / frame_w)), interpolation=cv2.INTER_AREA)
+
+
+def prepare_display_frame(frame):
+    """
+    Resize a captured frame to the display width
+    
+    :param frame: captured BGR frame
+    :return: tuple (display frame, the same frame as a cv2.UMat on the OpenCL
+        device, or None when the T-API is not used)
+    """
+    # With the T-API the camera frame is uploaded once; the display-size copy
+    # stays on the device so the inference frame is derived from it there
+    if cv2.ocl.useOpenCL():
+        device_frame = resize_to_width(cv2.UMat(frame), DISPLAY_WIDTH, frame.shape)
+        return device_frame.get(), device_frame
+    return resize_to_width(frame, DISPLAY_WIDTH), None
+
+
+def resize_for_inference(frame, device_frame=None):
+    """
+    Downscale a BGR frame to the width sent to MediaPipe
+    
+    :param frame: display-size BGR frame
+    :param device_frame: frame on the OpenCL device, from prepare_display_frame
+    :return: downscaled BGR frame (a cv2.UMat if device_frame is given)
+    """
+    if device_frame is not None:
+        return resize_to_width(device_frame, INFERENCE_WIDTH, frame.shape)
+    return resize_to_width(frame, INFERENCE_WIDTH)
+
+
+def prepare_inference_frame(frame, device_frame=None):
+    """
+    Downscaled RGB copy of a BGR frame, as sent to MediaPipe
+    
+    :param frame: display-size BGR frame
+    :param device_frame: frame on the OpenCL device, from prepare_display_frame
+    :return: downscaled RGB frame
+    """
+    # (resize first so the BGR->RGB conversion only touches the small image)
+    rgb_small = cv2.cvtColor(resize_for_inference(frame, device_frame), cv2.COLOR_BGR2RGB)
+    # Only the small result is downloaded from the OpenCL device
+    return rgb_small.get() if device_frame is not None else rgb_small
+
+
+class EyeTracker:
+    """
+    MediaPipe landmark graph of one video source, plus the EAR and eye contours
+    computed from its latest landmarks
+    """
+    
+    def __init__(self, create_graph=True):
+        """
+        :param create_graph: False for a tracker whose landmarks are detected
+            in a worker process (see process_with_workers)
+        """
+        # MediaPipe graphs are not shareable between threads: one per source.
+        # Prefer the Tasks API (GPU capable), fall back to legacy Face Mesh
+        self.face_mesh = None
+        self.landmarker = create_face_landmarker() if create_graph else None
+        self.timestamp_ms = 0
+        if create_graph and self.landmarker is None:
+            self.face_mesh = mp.solutions.face_mesh.FaceMesh(
+                max_num_faces=1,
+                # Refinement also corrects the eyelid points used for EAR, and
+                # EYE_THRESHOLD is tuned on refined landmarks
+                refine_landmarks=True,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
+        # Preallocated buffers, filled in place from every new set of landmarks
+        self.landmarks = np.empty((NUM_LANDMARKS, 2), dtype=np.float32)
+        # Eye contours in the (N, 1, 2) int32 layout OpenCV drawing expects
+        self.left_eye_coords = np.empty((len(LEFT_EYE_LANDMARKS), 1, 2), dtype=np.int32)
+        self.right_eye_coords = np.empty((len(RIGHT_EYE_LANDMARKS), 1, 2), dtype=np.int32)
+        self.face_found = False
+        self.ear = 0.0
+        self.frame_index = 0
+    
+    def detect(self, rgb_small):
+        """
+        Run the landmark model on a downscaled RGB frame
+        
+        :param rgb_small: RGB frame sent to MediaPipe
+        :return: landmarks of the first face, or None if no face was found
+        """
+        if self.landmarker is not None:
+            # VIDEO mode requires strictly increasing timestamps
+            self.timestamp_ms = max(self.timestamp_ms + 1, int(time.monotonic() * 1000))
+            image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_small)
+            result = self.landmarker.detect_for_video(image, self.timestamp_ms)
+            return result.face_landmarks[0] if result.face_landmarks else None
+        
+        results = self.face_mesh.process(rgb_small)
+        return results.multi_face_landmarks[0].landmark if results.multi_face_landmarks else None
+    
+    def process(self, frame, device_frame=None):
+        """
+        Update EAR and eye contours from a display-size BGR frame
+        
+        :param frame: frame the eye contours will be drawn on
+        :param device_frame: frame on the OpenCL device, from prepare_display_frame
+        :return: True if a face is being tracked, False otherwise
+        """
+        # Process frame with MediaPipe only every MESH_EVERY_N_FRAMES frames;
+        # the eyes move little between frames, so the last landmarks are reused
+        if self.frame_index % MESH_EVERY_N_FRAMES == 0:
+            (frame_h, frame_w) = frame.shape[:2]
+            # MediaPipe gets a downscaled copy; landmarks are normalized, so they
+            # map back onto the full-size display frame unchanged
+            rgb_small = prepare_inference_frame(frame, device_frame)
+            landmarks = self.detect(rgb_small)
+            if landmarks is not None:
+                # Copy the landmarks once; skipped frames reuse EAR and contours
+                fill_landmark_buffer(landmarks, self.landmarks)
+            self.update(landmarks is not None, frame_w, frame_h)
+        self.frame_index += 1
+        return self.face_found
+    
+    def update(self, face_found, width, height):
+        """
+        Recompute EAR and eye contours from the landmark buffer
+        
+        :param face_found: whether the last detection found a face
+        :param width: width of the frame the eye contours will be drawn on
+        :param height: height of the frame the eye contours will be drawn on
+        :return: None
+        """
+        self.face_found = face_found
+        if face_found:
+            self.ear = calculate_eye_ratio(self.landmarks)
+            extract_eye_coordinates(self.landmarks, LEFT_EYE_IDX, width, height,
+                                    self.left_eye_coords)
+            extract_eye_coordinates(self.landmarks, RIGHT_EYE_IDX, width, height,
+                                    self.right_eye_coords)
+    
+    def close(self):
+        """
+        Release the MediaPipe graph
+        
+        :return: None
+        """
+        if self.landmarker is not None:
+            self.landmarker.close()
+        elif self.face_mesh is not None:
+            self.face_mesh.close()
+
+
+# Landmark graph of a worker process, created by init_worker
+WORKER_TRACKER = None
+
+
+def init_worker():
+    """
+    Worker initializer: create the worker's landmark graph once, since
+    creating it per task is slow
+    
+    :return: None
+    """
+    global WORKER_TRACKER
+    WORKER_TRACKER = EyeTracker()
+
+
+def detect_in_worker(jpeg):
+    """
+    Detect face landmarks in a worker process
+    
+    :param jpeg: JPEG-encoded downscaled BGR frame
+    :return: (N, 2) normalized landmarks, or None if no face was found
+    """
+    rgb_small = cv2.cvtColor(cv2.imdecode(jpeg, cv2.IMREAD_COLOR), cv2.COLOR_BGR2RGB)
+    landmarks = WORKER_TRACKER.detect(rgb_small)
+    if landmarks is None:
+        return None
+    return fill_landmark_buffer(landmarks, WORKER_TRACKER.landmarks)[:len(landmarks)].copy()
+
+
+def start_workers():
+    """
+    Start one single-process worker per source, so every graph sees all the
+    frames of its own camera in order (which Face Mesh tracking relies on)
+    
+    :return: list of executors, one per source
+    """
+    # Spawn instead of fork: workers must not inherit the audio, numba or
+    # OpenCL state of this process before creating their MediaPipe graphs
+    context = multiprocessing.get_context("spawn")
+    return [ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=init_worker)
+            for _ in SOURCES]
+
+
+def process_with_workers(workers, trackers, ready):
+    """
+    Update the trackers of the ready sources with landmarks detected in their
+    worker processes
+    
+    :param workers: executor of every source, from start_workers
+    :param trackers: EyeTracker of every source, created without a graph
+    :param ready: list of (source index, display-size frame, frame on the
+        OpenCL device or None)
+    :return: None
+    """
+    jobs = []
+    for i, frame, device_frame in ready:
+        tracker = trackers[i]
+        # Only frames due for detection are encoded and sent to the workers;
+        # JPEG keeps the pickled payload small
+        if tracker.frame_index % MESH_EVERY_N_FRAMES == 0:
+            small = resize_for_inference(frame, device_frame)
+            if device_frame is not None:
+                small = small.get()
+            ret, jpeg = cv2.imencode(".jpg", small)
+            if ret:
+                jobs.append((i, frame.shape[:2], workers[i].submit(detect_in_worker, jpeg)))
+        tracker.frame_index += 1
+    
+    # All sources were submitted before waiting, so they run in parallel
+    for i, (frame_h, frame_w), future in jobs:
+        landmarks = future.result()
+        tracker = trackers[i]
+        if landmarks is not None:
+            tracker.landmarks[:len(landmarks)] = landmarks
+        tracker.update(landmarks is not None, frame_w, frame_h)
+
+
+class StatusOverlay:
+    """
+    Status text panel of one window (EAR, closed-eyes time, alarm status),
+    rasterized only when its content changes and pasted onto every frame
+    """
+    
+    # Panel position (top-left corner) and size in the display frame
+    X = 500
+    Y = 0
+    WIDTH = 300
+    HEIGHT = 150
+    
+    # Minimum EAR change that triggers a redraw
+    EAR_TOLERANCE = 0.01
+    
+    def __init__(self):
+        self.image = np.zeros((self.HEIGHT, self.WIDTH, 3), dtype=np.uint8)
+        self.mask = np.zeros((self.HEIGHT, self.WIDTH, 1), dtype=bool)
+        self.drawn_ear = None
+        self.drawn_state = None
+    
+    def update(self, ear, closed_for):
+        """
+        Redraw the panel if the values it shows changed visibly
+        
+        :param ear: eye aspect ratio to show
+        :param closed_for: seconds the eyes have been closed
+        :return: None
+        """
+        closed_text = "Closed: {:.1f}s".format(closed_for)
+        alarm_type = AUDIO_LIBRARY if AUDIO_LIBRARY else "System"
+        state = (closed_text, ALARM_ON, alarm_type)
+        if (state == self.drawn_state and self.drawn_ear is not None
+                and abs(ear - self.drawn_ear) <= self.EAR_TOLERANCE):
+            return
+        self.drawn_ear = ear
+        self.drawn_state = state
+        
+        panel = self.image
+        panel[:] = 0
+        
+        # Show EAR on screen with color based on status
+        ear_color = (0, 0, 255) if ALARM_ON else (0, 255, 0)
+        cv2.putText(panel, "EAR: {:.3f}".format(ear), (0, 30 - self.Y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, ear_color, 2)
+        
+        # Show how long the eyes have been closed
+        cv2.putText(panel, closed_text, (0, 60 - self.Y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, ear_color, 2)
+        
+        # Show alarm status
+        status_text = "ALARM: ACTIVE" if ALARM_ON else "ALARM: INACTIVE"
+        status_color = (0, 0, 255) if ALARM_ON else (0, 255, 0)
+        cv2.putText(panel, status_text, (0, 90 - self.Y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, status_color, 2)
+        
+        # Show type of alarm being used
+        cv2.putText(panel, f"Audio: {alarm_type}", (0, 120 - self.Y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        
+        # Show how to quit
+        cv2.putText(panel, f"Press 'q' to quit", (0, 140 - self.Y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        
+        # Text pixels are the only non-black ones
+        np.any(panel, axis=2, out=self.mask[:, :, 0])
+    
+    def draw(self, frame):
+        """
+        Paste the panel's text pixels onto a frame
+        
+        :param frame: display frame to draw on
+        :return: None
+        """
+        h = min(self.HEIGHT, frame.shape[0] - self.Y)
+        w = min(self.WIDTH, frame.shape[1] - self.X)
+        if h <= 0 or w <= 0:
+            return
+        roi = frame[self.Y:self.Y + h, self.X:self.X + w]
+        np.copyto(roi, self.image[:h, :w], where=self.mask[:h, :w])
+
+
+def draw_status(frame, tracker, overlay):
+    """
+    Draw eye contours and detector status on a frame
+    
+    :param frame: display frame to draw on
+    :param tracker: EyeTracker of the source the frame comes from
+    :param overlay: StatusOverlay of the window the frame is shown in
+    :return: None
+    """
+    if not tracker.face_found:
+        # No face detected - keep alarm if it was active
+        cv2.putText(frame, "No face detected", (10, 30),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+        return
+    
+    # Draw eye contours: the eye landmarks are already ordered around the
+    # eyelids, so a closed polyline replaces the convex hull
+    cv2.polylines(frame, [tracker.left_eye_coords, tracker.right_eye_coords], True, (0, 255, 0), 1)
+    
+    if ALARM_ON:
+        # Show alert on screen (with more intense color)
+        cv2.putText(frame, "[ALERT] DROWSINESS DETECTED!", (10, 30),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 3)
+        cv2.putText(frame, "WAKE UP! STOP TO REST!", (10, 70),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
+    
+    # Status text is only re-rendered when it changes
+    closed_for = time.monotonic() - EYES_CLOSED_SINCE if EYES_CLOSED_SINCE is not None else 0.0
+    overlay.update(tracker.ear, closed_for)
+    overlay.draw(frame)
+
+
+def main():
+    """
+    Run the drowsiness detector until 'q' (or Ctrl+C) is pressed
+    
+    :return: None
+    """
+    # ALARM_ON is read by the alarm thread, EYES_CLOSED_SINCE by draw_status
+    global ALARM_ON, ALARM_THREAD, EYES_CLOSED_SINCE
+    
+    # construct the argument parser and parse the arguments
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--no-display", action="store_true",
+                    help="run headless, without showing video windows (Ctrl+C to quit)")
+    args = vars(ap.parse_args())
+    
+    # Check available audio library
+    print("[INFO] Checking audio libraries...")
+    check_audio_library()
+    check_system_alarm()
+    
+    # Configure OpenCV threading and OpenCL for the non-MediaPipe image ops
+    if configure_opencv():
+        print(f"[INFO] Using OpenCL: {cv2.ocl.Device.getDefault().name()}")
+    
+    # Compile the EAR kernel now so the main loop never pays the JIT cost
+    if NUMBA_AVAILABLE:
+        print("[INFO] Compiling EAR kernel with numba...")
+        calculate_eye_ratio(np.zeros((NUM_LANDMARKS, 2), dtype=np.float32))
+    
+    # Initialize MediaPipe: one Face Mesh graph per source, either in this
+    # process (run by a thread pool) or in one worker process per source
+    workers = None
+    executor = None
+    if USE_PROCESS_POOL:
+        print("[INFO] Starting landmark worker processes...")
+        workers = start_workers()
+        trackers = [EyeTracker(create_graph=False) for _ in SOURCES]
+    else:
+        trackers = [EyeTracker() for _ in SOURCES]
+        # Face Mesh graphs release the GIL while running, so sources are processed in parallel
+        executor = ThreadPoolExecutor(max_workers=len(SOURCES))
+    
+    # initialize video streams
+    print("[INFO] Starting video stream...")
+    streams = []
+    new_frame = Condition()  # notified by every stream on each new frame
+    for src in SOURCES:
+        vs = FrameGrabber(src, TARGET_FPS, new_frame)
+        if not vs.cap.isOpened():
+            print(f"[ERROR] Could not open webcam {src}")
+            raise SystemExit(1)
+        streams.append(vs.start())
+    time.sleep(2.0)
+    
+    if args["no_display"]:
+        print("[INFO] Drowsiness detector started without display. Press Ctrl+C to quit.")
+    else:
+        print("[INFO] Drowsiness detector started. Press 'q' to quit.")
+    print(f"[INFO] Eye threshold: {EYE_THRESHOLD}")
+    print(f"[INFO] Required closed-eyes time: {CLOSED_EYES_SECONDS}s")
+    if AUDIO_LIBRARY:
+        print(f"[INFO] Alarm file: {ALARM_FILE}")
+    else:
+        print("[INFO] Using system alarm")
+    
+    # Bind the constants and callables the loop uses per frame to locals: local
+    # lookups are array indexing, global and attribute lookups are dict lookups
+    eye_threshold = EYE_THRESHOLD
+    closed_eyes_seconds = CLOSED_EYES_SECONDS
+    source_timeout = SOURCE_TIMEOUT
+    render_interval = 1.0 / DISPLAY_FPS
+    no_display = args["no_display"]
+    monotonic = time.monotonic
+    prepare_display = prepare_display_frame
+    imshow = cv2.imshow
+    waitKey = cv2.waitKey
+    window_names = [f"Drowsiness Detector - MediaPipe ({src})" for src in SOURCES]
+    overlays = [StatusOverlay() for _ in SOURCES]
+    quit_key = ord("q")
+    
+    def process_source(item):
+        i, frame, device_frame = item
+        return trackers[i].process(frame, device_frame)
+    
+    # loop over video frames
+    frame_ids = [0] * len(SOURCES)
+    last_frame_times = [monotonic()] * len(SOURCES)
+    last_render_time = 0.0
+    try:
+        while True:
+            # Wait until any source has a new frame, so a stalled camera
+            # never holds back the others
+            with new_frame:
+                new_frame.wait_for(
+                    lambda: any(vs.frame_id != frame_ids[i] for i, vs in enumerate(streams)),
+                    timeout=1.0
+                )
             
-            # Average EAR
-            ear = (left_ear + right_ear) / 2.0
+            # Collect a fresh frame from every source that has one, without waiting
+            now = monotonic()
+            ready = []
+            for i, vs in enumerate(streams):
+                new_id, frame = vs.read(frame_ids[i], timeout=0)
+                if frame is None or new_id == frame_ids[i]:
+                    # A source silent for too long (stalled or unplugged camera)
+                    # no longer counts as tracking a face, so its last EAR
+                    # cannot hold the alarm
+                    if now - last_frame_times[i] > source_timeout:
+                        trackers[i].face_found = False
+                    continue
+                frame_ids[i] = new_id
+                last_frame_times[i] = now
+                ready.append((i, *prepare_display(frame)))
+            if not ready:
+                # No camera delivered a frame: keep polling the keyboard so
+                # 'q' still quits while every source is stalled
+                if not no_display and waitKey(1) & 0xFF == quit_key:
+                    break
+                continue
             
-            # Extract coordinates to draw eye contours
-            left_eye_coords = extract_eye_coordinates(face_landmarks.landmark, LEFT_EYE_LANDMARKS)
-            right_eye_coords = extract_eye_coordinates(face_landmarks.landmark, RIGHT_EYE_LANDMARKS)
+            # Run every source's Face Mesh graph concurrently
+            if workers is not None:
+                process_with_workers(workers, trackers, ready)
+            else:
+                list(executor.map(process_source, ready))
             
-            # Draw eye contours
-            left_hull = cv2.convexHull(left_eye_coords)
-            right_hull = cv2.convexHull(right_eye_coords)
-            cv2.drawContours(frame, [left_hull], -1, (0, 255, 0), 1)
-            cv2.drawContours(frame, [right_hull], -1, (0, 255, 0), 1)
+            # Aggregate: the most closed eyes among the tracked faces drive the
+            # alarm; sources briefly without a new frame keep their last EAR
+            # until SOURCE_TIMEOUT
+            ears = [tracker.ear for tracker in trackers if tracker.face_found]
             
-            # Check if EAR is below threshold
-            if ear < EYE_THRESHOLD:
-                COUNTER += 1
+            if ears:
+                ear = min(ears)
+                
+                # Drowsiness is measured in wall-clock time, so it does not depend on
+                # how many frames per second are actually processed
+                now = monotonic()
                 
-                # If reached consecutive frames number, start alarm
-                if COUNTER >= NUM_CONSECUTIVE_FRAMES:
-                    if not ALARM_ON:
+                # The alarm state is shared with the alarm thread and draw_status:
+                # read it once per frame, write it back only when it changes
+                alarm_on = ALARM_ON
+                eyes_closed_since = EYES_CLOSED_SINCE
+                
+                if ear < eye_threshold:
+                    if eyes_closed_since is None:
+                        EYES_CLOSED_SINCE = now
+                    
+                    # Start alarm once, when the eyes have been closed long enough
+                    elif not alarm_on and now - eyes_closed_since >= closed_eyes_seconds:
                         ALARM_ON = True
                         print(f"[ALERT] Drowsiness detected! EAR: {ear:.3f}")
                         # Start continuous alarm thread
                         ALARM_THREAD = Thread(target=trigger_continuous_alarm)
                         ALARM_THREAD.daemon = True
                         ALARM_THREAD.start()
-                    
-                    # Show alert on screen (with more intense color)
-                    cv2.putText(frame, "[ALERT] DROWSINESS DETECTED!", (10, 30),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 3)
-                    cv2.putText(frame, "WAKE UP! STOP TO REST!", (10, 70),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
-            
-            else:
-                # EAR returned to normal - turn off alarm only if it was active
-                if ALARM_ON:
-                    ALARM_ON = False
-                    print(f"[INFO] Alarm turned off. EAR returned to normal: {ear:.3f}")
                 
-                # Reset counter only when EAR returns to normal
-                COUNTER = 0
-            
-            # Show EAR on screen with color based on status
-            ear_color = (0, 0, 255) if ALARM_ON else (0, 255, 0)
-            cv2.putText(frame, "EAR: {:.3f}".format(ear), (500, 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, ear_color, 2)
-            
-            # Show counter
-            cv2.putText(frame, "Counter: {}".format(COUNTER), (500, 60),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, ear_color, 2)
+                else:
+                    # EAR returned to normal - turn off alarm only if it was active
+                    if alarm_on:
+                        ALARM_ON = False
+                        print(f"[INFO] Alarm turned off. EAR returned to normal: {ear:.3f}")
+                    
+                    # Reset the closed-eyes timer only when EAR returns to normal
+                    if eyes_closed_since is not None:
+                        EYES_CLOSED_SINCE = None
             
-            # Show alarm status
-            status_text = "ALARM: ACTIVE" if ALARM_ON else "ALARM: INACTIVE"
-            status_color = (0, 0, 255) if ALARM_ON else (0, 255, 0)
-            cv2.putText(frame, status_text, (500, 90),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, status_color, 2)
+            # Render at most DISPLAY_FPS times per second, independently of the
+            # inference rate; the 'q' key is only polled on rendered frames
+            now = monotonic()
+            if no_display or now - last_render_time < render_interval:
+                continue
+            last_render_time = now
             
-            # Show type of alarm being used
-            alarm_type = AUDIO_LIBRARY if AUDIO_LIBRARY else "System"
-            cv2.putText(frame, f"Audio: {alarm_type}", (500, 120),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            # Show frames, one window per source
+            for i, frame, _ in ready:
+                draw_status(frame, trackers[i], overlays[i])
+                imshow(window_names[i], frame)
+            key = waitKey(1) & 0xFF
             
-            # Show how to quit
-            cv2.putText(frame, f"Press 'q' to quit", (500, 140),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            # Exit with 'q'
+            if key == quit_key:
+                break
+    except KeyboardInterrupt:
+        pass
     
-    else:
-        # No face detected - keep alarm if it was active
-        cv2.putText(frame, "No face detected", (10, 30),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+    # Cleanup
+    print("[INFO] Shutting down...")
+    ALARM_ON = False  # Stop alarm before shutting down
     
-    # Show frame
-    cv2.imshow("Drowsiness Detector - MediaPipe", frame)
-    key = cv2.waitKey(1) & 0xFF
+    # Wait for alarm thread to finish
+    if ALARM_THREAD and ALARM_THREAD.is_alive():
+        time.sleep(0.5)
+    
+    # Clean pygame if it was used
+    if AUDIO_LIBRARY == "pygame":
+        try:
+            import pygame
+            pygame.mixer.quit()
+        except:
+            pass
+    
+    cv2.destroyAllWindows()
+    if workers is not None:
+        for worker in workers:
+            worker.shutdown()
+    else:
+        executor.shutdown()
+    for vs in streams:
+        vs.stop()
+    for tracker in trackers:
+        tracker.close()
+    print("[INFO] System shut down.")
     
-    # Exit with 'q'
-    if key == ord("q"):
-        break
-
-# Cleanup
-print("[INFO] Shutting down...")
-ALARM_ON = False  # Stop alarm before shutting down
-
-# Wait for alarm thread to finish
-if ALARM_THREAD and ALARM_THREAD.is_alive():
-    time.sleep(0.5)
-
-# Clean pygame if it was used
-if AUDIO_LIBRARY == "pygame":
-    try:
-        import pygame
-        pygame.mixer.quit()
-    except:
-        pass
 
-cv2.destroyAllWindows()
-vs.stop()
-face_mesh.close()
-print("[INFO] System shut down.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()